@@ -7,6 +7,7 @@
 #     "redis>=5.0.0",
 #     "psycopg[binary]>=3.1.0",
 #     "pendulum>=3.0.0",
+#     "orjson>=3.9.0",
 # ]
 # ///
 """
@@ -22,10 +23,10 @@ Usage:
 """
 
 import asyncio
-import json
 import sys
 from pathlib import Path
 
+import orjson
 import typer
 
 # Add the src directory to the path so we can import greatloom
@@ -83,10 +84,8 @@ def transform(
     _, transformed_body = asyncio.run(do_transform())
 
     # Output
-    if pretty:
-        print(json.dumps(transformed_body, indent=2))
-    else:
-        print(json.dumps(transformed_body))
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    print(orjson.dumps(transformed_body, option=option).decode())
 
 
 if __name__ == "__main__":
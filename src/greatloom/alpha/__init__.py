@@ -12,9 +12,14 @@ request transformation.
 """
 
 import asyncio
-import json
+import datetime
+import functools
 import logging
+import os
+import time
+import zoneinfo
 
+import orjson
 import pendulum
 
 from . import soul, hud, capsule, intro, compact, memories, token_count, scrub, context
@@ -24,39 +29,172 @@ logger = logging.getLogger(__name__)
 # Canary for structured input from Duckpond
 ALPHA_CANARY = "ALPHA_METADATA_UlVCQkVSRFVDSw"
 
+# Static section headers for the system blocks
+_HERE_HEADER = "## Here\n\n"
+_EVENTS_HEADER = "## Events\n\n"
+_TODOS_HEADER = "## Todos\n\n"
+_CONTEXT_HINTS_HEADER = (
+    "## Context available\n\n"
+    "**BLOCKING REQUIREMENT:** When working on topics listed below, you MUST read "
+    "the corresponding file BEFORE proceeding. Use the Read tool.\n\n"
+)
 
-def _is_metadata_envelope(text: str) -> dict | None:
-    """Check if text is a valid metadata envelope (OLD format with prompt inside).
+_LA_TZ = zoneinfo.ZoneInfo("America/Los_Angeles")
 
-    Six-layer defense against false positives:
+
+@functools.lru_cache(maxsize=1)
+def _la_date_time(minute: int) -> tuple[str, str]:
+    """Los Angeles date and time strings for a minute since the epoch.
+
+    Only minute precision is ever shown, so every request within the same
+    minute reuses one result.
+    """
+    now = datetime.datetime.fromtimestamp(minute * 60, _LA_TZ)
+    # Same output as pendulum's "dddd, MMMM D, YYYY" / "h:mm A", without
+    # the platform-specific %-d / %-I
+    date_str = f"{now:%A, %B} {now.day}, {now.year}"
+    time_str = f"{now.hour % 12 or 12}:{now:%M %p}"
+    return date_str, time_str
+
+
+@functools.lru_cache(maxsize=32)
+def _client_line(client_name: str) -> str:
+    """The Here block's client line. Clients are a handful of fixed names."""
+    return f"**Client:** {client_name.title()}\n"
+
+
+# context.load_context() hands back the same cached strings until a file
+# changes, so their hashes are already computed and these lookups are cheap.
+@functools.lru_cache(maxsize=64)
+def _context_text(path: str, content: str) -> str:
+    """System block text for an autoload=all ALPHA.md file."""
+    return f"## Context: {path}\n\n{content}"
+
+
+@functools.lru_cache(maxsize=8)
+def _context_hints_text(hints: tuple[str, ...]) -> str:
+    """System block text listing the autoload=when ALPHA.md hints."""
+    return _CONTEXT_HINTS_HEADER + "\n".join(f"- {hint}" for hint in hints)
+
+
+# Upper bounds (seconds) on the dynamic-context fetches. A stalled Redis or
+# Postgres costs us that section of the prompt, not the whole request.
+HUD_TIMEOUT = 0.5
+CAPSULE_TIMEOUT = 2.0
+INTRO_TIMEOUT = 0.5
+
+
+async def _fetch_with_timeout(name: str, coro, timeout: float, default):
+    """Await a fetch with a deadline, returning default on timeout or error."""
+    try:
+        return await asyncio.wait_for(coro, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("%s timed out after %ss", name, timeout)
+    except Exception as e:
+        logger.warning("%s failed: %s", name, e)
+    return default
+
+
+# Debug checkpoints of the last request, before and after transformation.
+# Off unless ALPHA_DEBUG_DUMPS=1, so production skips the serialize entirely.
+ALPHA_DEBUG_DUMPS = os.environ.get("ALPHA_DEBUG_DUMPS") == "1"
+_CHECKPOINT_PRE = "/data/last_alpha_request_pre.json"
+_CHECKPOINT_POST = "/data/last_alpha_request_post.json"
+
+# Checkpoints waiting to be written, newest per path. A single writer task
+# drains this, so a burst of requests costs one write per file, not one each.
+_pending_checkpoints: dict[str, bytes] = {}
+_checkpoint_writer: asyncio.Task | None = None
+
+
+def _write_checkpoint(path: str, data: bytes) -> None:
+    """Overwrite path with data.
+
+    Written in place rather than temp-file-and-rename: compose bind-mounts
+    these files individually, and renaming over a mount point fails.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def _drain_checkpoints() -> None:
+    """Write pending checkpoints off the event loop until none are left."""
+    while _pending_checkpoints:
+        path, data = _pending_checkpoints.popitem()
+        try:
+            await asyncio.to_thread(_write_checkpoint, path, data)
+        except Exception as e:
+            logger.warning("Failed to dump %s: %s", path, e)
+
+
+def _queue_checkpoint(path: str, data: bytes) -> None:
+    """Queue a debug checkpoint, replacing any older one for the same path."""
+    global _checkpoint_writer
+    _pending_checkpoints[path] = data
+    if _checkpoint_writer is None or _checkpoint_writer.done():
+        _checkpoint_writer = asyncio.create_task(_drain_checkpoints())
+
+
+def _parse_alpha_metadata(text: str) -> dict | None:
+    """Parse text as Alpha metadata JSON (either format), or return None.
+
+    Shared layers 1-4 of the envelope defense, so a block is parsed at most
+    once no matter which format it turns out to be:
     1. Text starts with '{' and ends with '}' (must BE JSON, not contain it)
     2. Parses as valid JSON
     3. Has 'canary' key
     4. Canary value matches ALPHA_CANARY exactly
-    5. Has 'prompt' key (our contract for OLD format)
-    6. (Caller ensures role==user and type==text)
-
-    This protects against nightmare scenarios like the canary appearing in
-    tool results (e.g., Edit calls writing code that mentions the canary).
     """
-    text = text.strip()
-
     # Layer 1: Must look like standalone JSON
-    if not (text.startswith("{") and text.endswith("}")):
+    # Checked first: it only touches the ends of the text, so ordinary prose
+    # is rejected in O(1) before the O(n) canary scan below. Find the
+    # first/last non-whitespace chars instead of strip()-copying the block.
+    n = len(text)
+    i = 0
+    while i < n and text[i].isspace():
+        i += 1
+    j = n
+    while j > i and text[j - 1].isspace():
+        j -= 1
+    if i == j or text[i] != "{" or text[j - 1] != "}":
+        return None
+
+    # Cheap probe before any parsing: no canary, no metadata. Rejects big
+    # JSON-shaped tool output without handing it to the parser.
+    # Block text is always str here (the body was decoded by orjson.loads),
+    # so there's no bytes variant - the raw request bytes are long gone.
+    # Not an anchored '{"canary": ...' regex: nothing guarantees key order.
+    if ALPHA_CANARY not in text:
         return None
 
     # Layer 2: Must parse as valid JSON
     try:
-        envelope = json.loads(text)
-    except json.JSONDecodeError:
+        parsed = orjson.loads(text[i:j] if (i or j != n) else text)
+    except orjson.JSONDecodeError:
         return None
 
     # Layer 3 & 4: Must have canary key with exact value
-    if envelope.get("canary") != ALPHA_CANARY:
+    if parsed.get("canary") != ALPHA_CANARY:
         return None
 
+    return parsed
+
+
+def _is_metadata_envelope(text: str) -> dict | None:
+    """Check if text is a valid metadata envelope (OLD format with prompt inside).
+
+    Six-layer defense against false positives:
+    1-4. See _parse_alpha_metadata (standalone JSON with our exact canary)
+    5. Has 'prompt' key (our contract for OLD format)
+    6. (Caller ensures role==user and type==text)
+
+    This protects against nightmare scenarios like the canary appearing in
+    tool results (e.g., Edit calls writing code that mentions the canary).
+    """
+    envelope = _parse_alpha_metadata(text)
+
     # Layer 5: Must have prompt key (this distinguishes OLD format from NEW)
-    if "prompt" not in envelope:
+    if envelope is None or "prompt" not in envelope:
         return None
 
     return envelope
@@ -71,34 +209,74 @@ def _is_metadata_block(text: str) -> dict | None:
 
     Returns parsed metadata or None.
     """
-    text = text.strip()
+    metadata = _parse_alpha_metadata(text)
 
-    # Must look like standalone JSON
-    if not (text.startswith("{") and text.endswith("}")):
+    # Must NOT have prompt key (that's the old format)
+    if metadata is None or "prompt" in metadata:
         return None
 
-    # Must parse as valid JSON
+    return metadata
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_created(created_at: str) -> datetime.datetime:
+    """Parse a memory timestamp. Memories recur turn after turn, so cache.
+
+    Plain ISO 8601 goes through the stdlib parser, which is far cheaper than
+    pendulum's general one; anything it rejects still gets pendulum.parse
+    (whose DateTime is a datetime). Naive times are UTC, as pendulum has it.
+    """
     try:
-        metadata = json.loads(text)
-    except json.JSONDecodeError:
-        return None
+        dt = datetime.datetime.fromisoformat(created_at)
+    except ValueError:
+        return pendulum.parse(created_at)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt
 
-    # Must have canary key with exact value
-    if metadata.get("canary") != ALPHA_CANARY:
-        return None
 
-    # Must NOT have prompt key (that's the old format)
-    if "prompt" in metadata:
-        return None
+def _clock(dt: datetime.datetime) -> str:
+    """pendulum's "h:mm A" without the glibc-only %-I."""
+    return f"{dt.hour % 12 or 12}:{dt:%M %p}"
 
-    return metadata
 
+@functools.lru_cache(maxsize=1024)
+def _relative_time(created_at: str, minute: int) -> str:
+    """Relative time for created_at, as of the given minute since the epoch.
 
-def _format_memory_inline(memory: dict) -> str:
+    Keyed on the minute so results are reused within it and simply age out
+    of the LRU afterwards. Days are calendar days in the memory's own
+    timezone (matching pendulum's diff().in_days()), computed from plain
+    dates - no pendulum.now() or Diff objects per memory.
+    """
+    try:
+        dt = _parse_created(created_at)
+    except Exception:
+        return created_at  # fallback
+
+    today = datetime.datetime.fromtimestamp(minute * 60, dt.tzinfo).date()
+    days = abs((today - dt.date()).days)
+    if days == 0:
+        return f"today at {_clock(dt)}"
+    elif days == 1:
+        return f"yesterday at {_clock(dt)}"
+    elif days < 7:
+        return f"{days} days ago"
+    elif days < 30:
+        weeks = days // 7
+        return f"{weeks} week{'s' if weeks > 1 else ''} ago"
+    else:
+        # pendulum's "ddd MMM D YYYY"
+        return f"{dt:%a %b} {dt.day} {dt.year}"
+
+
+def _format_memory_inline(memory: dict, minute: int) -> str:
     """Format a memory for inline inclusion in the prompt string.
 
     Uses the same format as memories.format_memory_block() but imported here
     to avoid circular imports. Keep these in sync!
+
+    `minute` is "now" as minutes since the epoch, computed once per envelope.
     """
     mem_id = memory.get("id", "?")
     created_at = memory.get("created_at", "")
@@ -106,25 +284,7 @@ def _format_memory_inline(memory: dict) -> str:
     score = memory.get("score")
 
     # Simple relative time formatting
-    relative_time = created_at  # fallback
-    try:
-        import pendulum
-        dt = pendulum.parse(created_at)
-        now = pendulum.now(dt.timezone or "America/Los_Angeles")
-        diff = now.diff(dt)
-        if diff.in_days() == 0:
-            relative_time = f"today at {dt.format('h:mm A')}"
-        elif diff.in_days() == 1:
-            relative_time = f"yesterday at {dt.format('h:mm A')}"
-        elif diff.in_days() < 7:
-            relative_time = f"{diff.in_days()} days ago"
-        elif diff.in_days() < 30:
-            weeks = diff.in_days() // 7
-            relative_time = f"{weeks} week{'s' if weeks > 1 else ''} ago"
-        else:
-            relative_time = dt.format("ddd MMM D YYYY")
-    except Exception:
-        pass
+    relative_time = _relative_time(created_at, minute)
 
     # Include score if present (helps with debugging/transparency)
     score_str = f", score {score:.2f}" if score else ""
@@ -140,9 +300,10 @@ def _build_unwrapped_text(envelope: dict) -> str:
         return prompt
 
     # Build: prompt + blank line + each memory separated by blank lines
+    minute = int(time.time() // 60)
     parts = [prompt]
     for mem in memories_list:
-        parts.append(_format_memory_inline(mem))
+        parts.append(_format_memory_inline(mem, minute))
 
     return "\n\n".join(parts)
 
@@ -157,11 +318,12 @@ def unwrap_structured_input(body: dict) -> tuple[dict, dict | None]:
        -> Remove the metadata block entirely, preserve other content blocks
 
     Algorithm:
-    1. Iterate over ALL messages
+    1. Iterate over ALL messages, newest first
     2. For each user message:
        - OLD format: find envelope, replace with prompt + memories
        - NEW format: find metadata block, extract and REMOVE it
-    3. Keep metadata only from the LAST user message (current turn)
+    3. Keep metadata only from the LAST user message (current turn), i.e.
+       the first one we meet walking backwards
 
     Memories are DURABLE: they stay in context on future turns.
 
@@ -174,7 +336,14 @@ def unwrap_structured_input(body: dict) -> tuple[dict, dict | None]:
     last_metadata = None
     cleaned_count = 0
 
-    for msg in messages:
+    # Older turns still carry their envelopes (the client resends history
+    # verbatim), so every user message gets cleaned - but metadata is only
+    # captured once, from the newest message that has any.
+    #
+    # No whole-body canary prescreen: orjson-dumping the messages just to
+    # search them measured ~6x slower than this walk, which already skips
+    # non-user messages and non-canary blocks cheaply.
+    for msg in reversed(messages):
         # Layer 6a: Only process user messages
         if msg.get("role") != "user":
             continue
@@ -182,43 +351,56 @@ def unwrap_structured_input(body: dict) -> tuple[dict, dict | None]:
         content = msg.get("content")
 
         # Handle string content (OLD format only)
-        if isinstance(content, str):
+        # Bodies come straight from orjson, so exact type checks are safe
+        if type(content) is str:
             envelope = _is_metadata_envelope(content)
             if envelope:
                 msg["content"] = _build_unwrapped_text(envelope)
-                last_metadata = envelope
+                if last_metadata is None:
+                    last_metadata = envelope
                 cleaned_count += 1
 
         # Handle array of content blocks (OLD or NEW format)
-        elif isinstance(content, list):
+        elif type(content) is list:
+            msg_metadata = None
             blocks_to_remove = []
 
             for i, block in enumerate(content):
-                # Only process text blocks
-                if not isinstance(block, dict) or block.get("type") != "text":
+                # Only process text blocks. Assume the dict shape and let the
+                # rare odd block fall out via the exception.
+                try:
+                    if block["type"] != "text":
+                        continue
+                    text = block["text"]
+                except (KeyError, TypeError):
                     continue
 
-                text = block.get("text", "")
+                # Nearly every block is prose; skip the call entirely unless
+                # it could start a JSON object (maybe after whitespace)
+                first = text[:1]
+                if first != "{" and not first.isspace():
+                    continue
 
-                # Try OLD format first (envelope with prompt inside)
-                envelope = _is_metadata_envelope(text)
-                if envelope:
-                    # Replace the block's text with prompt + memories
-                    block["text"] = _build_unwrapped_text(envelope)
-                    last_metadata = envelope
-                    cleaned_count += 1
+                # Parse once, then tell the formats apart by the prompt key
+                parsed = _parse_alpha_metadata(text)
+                if parsed is None:
                     continue
 
-                # Try NEW format (metadata-only block, no prompt)
-                metadata = _is_metadata_block(text)
-                if metadata:
-                    # Mark block for removal
-                    blocks_to_remove.append(i)
-                    last_metadata = metadata
-                    cleaned_count += 1
+                if "prompt" in parsed:
+                    # OLD format: replace the block's text with prompt + memories
+                    block["text"] = _build_unwrapped_text(parsed)
+                else:
+                    # NEW format (metadata-only block): mark block for removal
                     # NOTE: No memory injection here anymore.
                     # Memories are now added as content blocks by Gazebo,
                     # so they're already in the array. We just remove metadata.
+                    blocks_to_remove.append(i)
+                msg_metadata = parsed
+                cleaned_count += 1
+
+            # The last envelope within the newest message wins
+            if last_metadata is None:
+                last_metadata = msg_metadata
 
             # Apply modifications AFTER iteration is complete
             # Remove metadata blocks (in reverse order to preserve indices)
@@ -227,7 +409,7 @@ def unwrap_structured_input(body: dict) -> tuple[dict, dict | None]:
 
     if cleaned_count > 0:
         mem_count = len(last_metadata.get("memories", [])) if last_metadata else 0
-        logger.info(f"Unwrapped {cleaned_count} envelope(s), {mem_count} memories preserved")
+        logger.info("Unwrapped %s envelope(s), %s memories preserved", cleaned_count, mem_count)
 
     # Return metadata from the last (current) turn only
     if last_metadata:
@@ -279,40 +461,62 @@ class AlphaPattern:
         """
 
         # === Checkpoint: Log raw incoming request ===
-        try:
-            with open("/data/last_alpha_request_pre.json", "w") as f:
-                json.dump({"headers": headers, "body": body, "metadata": metadata}, f, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to dump pre-request: {e}")
-
-        # === Phase 0: Check for auto-compact and rewrite if needed ===
-        # This must happen FIRST, before we inject the normal system prompt
-        body = compact.rewrite_auto_compact(body)
-
-        # === Phase 0.5: Scrub noise from context ===
-        # Remove known-bad blocks and substrings that add noise without value
-        body = scrub.scrub_noise(body)
-
-        # === Phase 1: Unwrap structured input (Duckpond) ===
-        # Duckpond wraps user prompts in JSON. Extract and merge metadata.
-        body, structured_meta = unwrap_structured_input(body)
-        if structured_meta:
-            if metadata is None:
-                metadata = structured_meta
-            else:
-                metadata = {**metadata, **structured_meta}
+        # Serialize now (the body is about to be mutated), write in the background
+        if ALPHA_DEBUG_DUMPS:
+            try:
+                pre_dump = orjson.dumps(
+                    {"headers": headers, "body": body, "metadata": metadata},
+                    option=orjson.OPT_INDENT_2,
+                )
+                _queue_checkpoint(_CHECKPOINT_PRE, pre_dump)
+            except Exception as e:
+                logger.warning("Failed to dump pre-request: %s", e)
 
         # Get context from headers
         machine_name = headers.get("x-machine-name", "unknown")
         session_id = headers.get("x-session-id", "")
         client_name = headers.get("x-loom-client")  # e.g., "duckpond"
 
-        # Fetch dynamic data in parallel
-        hud_data, (summary1, summary2), memorables = await asyncio.gather(
-            hud.fetch(),
-            capsule.fetch(),
-            intro.get_memorables(session_id),
+        # Fetch dynamic data in parallel, the network fetches each with its own
+        # deadline. None of it depends on the body, so start it now and let the
+        # I/O work while we run the CPU-bound body transforms below.
+        fetch_task = asyncio.gather(
+            _fetch_with_timeout("hud.fetch", hud.fetch(), HUD_TIMEOUT, hud.HUDData()),
+            _fetch_with_timeout("capsule.fetch", capsule.fetch(), CAPSULE_TIMEOUT, (None, None)),
+            _fetch_with_timeout("intro.get_memorables", intro.get_memorables(session_id), INTRO_TIMEOUT, []),
+            # ALPHA.md files: a directory walk and file reads, so off the loop
+            asyncio.to_thread(context.load_context),
         )
+        # Nothing awaits the fetches until the transforms are done, so if one
+        # of them raises (or we're cancelled), cancel the fetches rather than
+        # leave them orphaned
+        try:
+            # Yield once so the fetches actually send before we hog the loop
+            await asyncio.sleep(0)
+
+            # === Phase 0: Check for auto-compact and rewrite if needed ===
+            # This must happen FIRST, before we inject the normal system prompt
+            body = compact.rewrite_auto_compact(body)
+
+            # === Phase 0.5: Scrub noise from context ===
+            # Remove known-bad blocks and substrings that add noise without value
+            body = scrub.scrub_noise(body)
+
+            # === Phase 1: Unwrap structured input (Duckpond) ===
+            # Duckpond wraps user prompts in JSON. Extract and merge metadata.
+            body, structured_meta = unwrap_structured_input(body)
+            if structured_meta:
+                if metadata is None:
+                    metadata = structured_meta
+                else:
+                    metadata = {**metadata, **structured_meta}
+        except BaseException:
+            fetch_task.cancel()
+            # gather() reports its cancellation as an exception; mark it retrieved
+            fetch_task.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+        hud_data, (summary1, summary2), memorables, (context_blocks, context_hints) = await fetch_task
 
         # === Build the system blocks ===
         # Each logical piece gets its own block with a ## header.
@@ -320,7 +524,9 @@ class AlphaPattern:
         system_blocks = []
 
         # Soul - who I am (rarely changes, good cache candidate)
-        system_blocks.append({"type": "text", "text": f"# Alpha\n\n{soul.get_soul()}"})
+        # The text is built once at soul.init(); the dict stays fresh per
+        # request so nothing downstream can mutate a block shared across bodies.
+        system_blocks.append({"type": "text", "text": soul.get_soul_block()})
 
         # Capsules - what happened yesterday and last night
         # Each capsule is its own block (they come with ## headers from capsule.py)
@@ -339,44 +545,35 @@ class AlphaPattern:
 
         # Today so far (running summary)
         if hud_data.today_so_far:
-            now = pendulum.now("America/Los_Angeles")
-            date_str = now.format("dddd, MMMM D, YYYY")
-            time_str = hud_data.today_so_far_time or now.format("h:mm A")
+            date_str, now_str = _la_date_time(int(time.time() // 60))
+            time_str = hud_data.today_so_far_time or now_str
             system_blocks.append({
                 "type": "text",
                 "text": f"## Today so far ({date_str}, {time_str})\n\n{hud_data.today_so_far}"
             })
 
         # Here - where I am right now (client, machine, weather)
-        here_parts = []
-        if client_name:
-            here_parts.append(f"**Client:** {client_name.title()}")
-        here_parts.append(f"**Machine:** {machine_name}")
-        if hud_data.weather:
-            here_parts.append(f"\n{hud_data.weather}")
-        system_blocks.append({"type": "text", "text": "## Here\n\n" + "\n".join(here_parts)})
-
-        # ALPHA.md context files
+        client_line = _client_line(client_name) if client_name else ""
+        weather = f"\n\n{hud_data.weather}" if hud_data.weather else ""
+        system_blocks.append({
+            "type": "text",
+            "text": f"{_HERE_HEADER}{client_line}**Machine:** {machine_name}{weather}"
+        })
+
+        # ALPHA.md context files (loaded alongside the fetches above)
         # Each 'all' file becomes its own block; 'when' hints are collected
-        context_blocks, context_hints = context.load_context()
         for ctx in context_blocks:
-            system_blocks.append({
-                "type": "text",
-                "text": f"## Context: {ctx['path']}\n\n{ctx['content']}"
-            })
+            system_blocks.append({"type": "text", "text": _context_text(ctx["path"], ctx["content"])})
         if context_hints:
-            hints_text = "## Context available\n\n"
-            hints_text += "**BLOCKING REQUIREMENT:** When working on topics listed below, you MUST read the corresponding file BEFORE proceeding. Use the Read tool.\n\n"
-            hints_text += "\n".join(f"- {hint}" for hint in context_hints)
-            system_blocks.append({"type": "text", "text": hints_text})
+            system_blocks.append({"type": "text", "text": _context_hints_text(tuple(context_hints))})
 
         # Events - calendar
         if hud_data.calendar:
-            system_blocks.append({"type": "text", "text": f"## Events\n\n{hud_data.calendar}"})
+            system_blocks.append({"type": "text", "text": _EVENTS_HEADER + hud_data.calendar})
 
         # Todos
         if hud_data.todos:
-            system_blocks.append({"type": "text", "text": f"## Todos\n\n{hud_data.todos}"})
+            system_blocks.append({"type": "text", "text": _TODOS_HEADER + hud_data.todos})
 
         # === Add cache_control to the last block ===
         # Everything in the system prompt changes at most hourly (HUD refresh).
@@ -403,12 +600,12 @@ class AlphaPattern:
             body["system"] = system_blocks
 
         elif isinstance(existing_system, list) and len(existing_system) >= 1:
-            # Keep the billing header (element 0), replace everything else
-            billing_header = existing_system[0]
-            body["system"] = [billing_header] + system_blocks
+            # Keep the billing header (element 0), replace everything else.
+            # Slice assignment splices in place - no [header] + blocks copy.
+            existing_system[1:] = system_blocks
 
         else:
-            logger.warning(f"Unexpected system format: {type(existing_system)}, replacing entirely")
+            logger.warning("Unexpected system format: %s, replacing entirely", type(existing_system))
             body["system"] = system_blocks
 
         # NOTE: Memories are injected during unwrap_structured_input() now.
@@ -434,12 +631,13 @@ class AlphaPattern:
             is_tool_result = False
             if last_user_msg:
                 content = last_user_msg.get("content", [])
-                if isinstance(content, list):
-                    # If ANY block is a tool_result, this is tool plumbing
-                    is_tool_result = any(
-                        isinstance(block, dict) and block.get("type") == "tool_result"
-                        for block in content
-                    )
+                if type(content) is list:
+                    # If ANY block is a tool_result, this is tool plumbing.
+                    # Plain loop: no generator object, exits on the first hit.
+                    for block in content:
+                        if type(block) is dict and block.get("type") == "tool_result":
+                            is_tool_result = True
+                            break
 
             if is_tool_result:
                 logger.debug("Skipping Intro injection (tool result, not user message)")
@@ -448,14 +646,15 @@ class AlphaPattern:
                 intro.inject_as_final_message(body, session_id, block)
 
         context_count = len(context_blocks) + (1 if context_hints else 0)
-        logger.info(f"Injected Alpha system prompt ({len(system_blocks)} blocks, {context_count} from ALPHA.md)")
+        logger.info("Injected Alpha system prompt (%s blocks, %s from ALPHA.md)", len(system_blocks), context_count)
 
         # === Checkpoint: Log fully-composed request (post-processing) ===
-        try:
-            with open("/data/last_alpha_request_post.json", "w") as f:
-                json.dump(body, f, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to dump post-request: {e}")
+        if ALPHA_DEBUG_DUMPS:
+            try:
+                post_dump = orjson.dumps(body, option=orjson.OPT_INDENT_2)
+                _queue_checkpoint(_CHECKPOINT_POST, post_dump)
+            except Exception as e:
+                logger.warning("Failed to dump post-request: %s", e)
 
         # === Fire-and-forget: Count tokens for context window awareness ===
         # This runs in background, doesn't block the request
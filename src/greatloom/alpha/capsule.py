@@ -4,6 +4,7 @@ The past section of the system prompt comes from Capsule summaries:
 stored in cortex.summaries, generated by the Capsule service.
 """
 
+import asyncio
 import logging
 import os
 
@@ -33,31 +34,37 @@ def _format_summary(row: tuple) -> str:
     return f"{header}\n\n{summary}"
 
 
+def _fetch_sync() -> list[tuple]:
+    """Query the two most recent summaries (blocking)."""
+    import psycopg
+
+    with psycopg.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT period_start, period_end, summary
+                FROM cortex.summaries
+                ORDER BY period_start DESC
+                LIMIT 2
+            """)
+            return cur.fetchall()
+
+
 async def fetch() -> tuple[str | None, str | None]:
     """Get the two most recent Capsule summaries from Postgres.
 
     Returns (older_summary, newer_summary) as formatted strings,
     or None for each if not available.
 
-    Note: Uses sync psycopg inside async - the query is fast and
-    this keeps the code simple. Consider psycopg async pool if needed.
+    Note: Uses sync psycopg in a worker thread - the query is fast, and
+    the thread keeps a slow connect from blocking the event loop (and lets
+    the caller's timeout actually fire).
     """
     if not DATABASE_URL:
         logger.debug("No DATABASE_URL, skipping Capsule summaries")
         return None, None
 
     try:
-        import psycopg
-
-        with psycopg.connect(DATABASE_URL) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT period_start, period_end, summary
-                    FROM cortex.summaries
-                    ORDER BY period_start DESC
-                    LIMIT 2
-                """)
-                rows = cur.fetchall()
+        rows = await asyncio.to_thread(_fetch_sync)
 
         if not rows:
             return None, None
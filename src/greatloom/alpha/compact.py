@@ -62,6 +62,10 @@ This takes ten seconds and prevents twenty minutes of drift. Do it every time. T
 
 🦆. Continue with the last task that you were asked to work on."""
 
+# Both SDK variants end with this sentence, so one substring test rules out
+# the common case (neither present) before checking for either in full
+CONTINUATION_INSTRUCTION_TAIL = "Continue with the last task that you were asked to work on."
+
 # Alpha's clean replacement (no trailing instruction)
 CONTINUATION_INSTRUCTION_ALPHA = """Please pause before continuing. You just came back from a context compaction.
 
@@ -77,6 +81,13 @@ This takes ten seconds and prevents twenty minutes of drift. Do it every time. T
 🦆"""
 
 
+# Continuation variants to rewrite, most specific (longest match) first
+_CONTINUATION_REPLACEMENTS = (
+    (CONTINUATION_INSTRUCTION_POLLUTED, CONTINUATION_INSTRUCTION_ALPHA),
+    (CONTINUATION_INSTRUCTION_ORIGINAL, CONTINUATION_INSTRUCTION_ALPHA),
+)
+
+
 # === Fallback compact prompt (if git load fails) ===
 
 FALLBACK_COMPACT_PROMPT = "Summarize the conversation so far."
@@ -107,9 +118,11 @@ def rewrite_auto_compact(body: dict[str, Any]) -> dict[str, Any]:
 
     # Phase 1: Replace summarizer system prompt if present
     # (Belt-and-suspenders—AlphaPattern also injects soul upstream)
-    if _detect_auto_compact(system):
+    # Detection falls out of the replacement pass - one walk, not two
+    system, replaced = _replace_system_prompt(system)
+    if replaced:
         logger.info("Auto-compact detected via system prompt signature")
-        body["system"] = _replace_system_prompt(system)
+        body["system"] = system
 
     # Phase 2: Replace compact instructions in last user message
     # Run unconditionally—the signature is specific enough to not false-positive
@@ -122,21 +135,7 @@ def rewrite_auto_compact(body: dict[str, Any]) -> dict[str, Any]:
     return body
 
 
-def _detect_auto_compact(system: Any) -> bool:
-    """Check if the system prompt indicates auto-compaction."""
-    if isinstance(system, str):
-        return AUTO_COMPACT_SYSTEM_SIGNATURE in system
-
-    if isinstance(system, list):
-        for block in system:
-            if isinstance(block, dict) and block.get("type") == "text":
-                if AUTO_COMPACT_SYSTEM_SIGNATURE in block.get("text", ""):
-                    return True
-
-    return False
-
-
-def _replace_system_prompt(system: Any) -> Any:
+def _replace_system_prompt(system: Any) -> tuple[Any, bool]:
     """Replace only the summarizer block, preserving SDK preamble.
 
     The Agent SDK sends a multi-part system prompt:
@@ -144,22 +143,25 @@ def _replace_system_prompt(system: Any) -> Any:
     - Second block: The actual system prompt (or summarizer prompt during compact)
 
     We must preserve the first block or Anthropic rejects the request.
+
+    Returns (system, replaced) - replaced says whether the summarizer
+    prompt was found, so callers don't need a separate detection pass.
     """
     if isinstance(system, str):
         if AUTO_COMPACT_SYSTEM_SIGNATURE in system:
             logger.debug("Replacing string system prompt")
-            return ALPHA_COMPACT_SYSTEM
-        return system
+            return ALPHA_COMPACT_SYSTEM, True
+        return system, False
 
     if isinstance(system, list):
         for i, block in enumerate(system):
             if isinstance(block, dict) and block.get("type") == "text":
                 if AUTO_COMPACT_SYSTEM_SIGNATURE in block.get("text", ""):
                     block["text"] = ALPHA_COMPACT_SYSTEM
-                    logger.debug(f"Replaced summarizer block at index {i}, preserved {i} preceding block(s)")
-                    break
+                    logger.debug("Replaced summarizer block at index %s, preserved %s preceding block(s)", i, i)
+                    return system, True
 
-    return system
+    return system, False
 
 
 def _replace_compact_instructions(body: dict[str, Any]) -> None:
@@ -187,8 +189,8 @@ def _replace_compact_instructions(body: dict[str, Any]) -> None:
         content = message.get("content")
 
         if isinstance(content, str):
-            if COMPACT_INSTRUCTIONS_START in content:
-                idx = content.find(COMPACT_INSTRUCTIONS_START)
+            idx = content.find(COMPACT_INSTRUCTIONS_START)
+            if idx != -1:
                 original = content[:idx].rstrip()
                 message["content"] = original + "\n\n" + compact_prompt
                 logger.info("[Phase 2] ✓ Replaced compact instructions in string content")
@@ -197,16 +199,16 @@ def _replace_compact_instructions(body: dict[str, Any]) -> None:
             return
 
         if isinstance(content, list):
-            logger.debug(f"[Phase 2] Checking {len(content)} content blocks in last user message")
+            logger.debug("[Phase 2] Checking %s content blocks in last user message", len(content))
             for block_idx, block in enumerate(content):
                 if not isinstance(block, dict) or block.get("type") != "text":
                     continue
                 text = block.get("text", "")
-                if COMPACT_INSTRUCTIONS_START in text:
-                    idx = text.find(COMPACT_INSTRUCTIONS_START)
+                idx = text.find(COMPACT_INSTRUCTIONS_START)
+                if idx != -1:
                     original = text[:idx].rstrip()
                     block["text"] = original + "\n\n" + compact_prompt
-                    logger.info(f"[Phase 2] ✓ Replaced compact instructions in content block {block_idx}")
+                    logger.info("[Phase 2] ✓ Replaced compact instructions in content block %s", block_idx)
                     return
             logger.debug("[Phase 2] No compact signature found in any content block")
             return
@@ -216,6 +218,18 @@ def _replace_compact_instructions(body: dict[str, Any]) -> None:
         return
 
 
+def _replace_continuation_in_text(text: str) -> tuple[str, bool]:
+    """Try to replace continuation instructions. Returns (new_text, was_replaced)."""
+    if CONTINUATION_INSTRUCTION_TAIL not in text:
+        return text, False
+    for needle, replacement in _CONTINUATION_REPLACEMENTS:
+        # Replace from the found index on, so the prefix isn't searched twice
+        idx = text.find(needle)
+        if idx != -1:
+            return text[:idx] + text[idx:].replace(needle, replacement), True
+    return text, False
+
+
 def _replace_continuation_instruction(body: dict[str, Any]) -> None:
     """Replace the post-compact continuation instruction.
 
@@ -232,49 +246,36 @@ def _replace_continuation_instruction(body: dict[str, Any]) -> None:
     100% sure where Claude Code puts this thing.
     """
     messages = body.get("messages", [])
-    user_message_count = sum(1 for m in messages if m.get("role") == "user")
-    logger.debug(f"[Phase 3] Scanning {user_message_count} user messages for continuation instruction")
-
+    user_message_count = 0
     replacements_made = 0
 
-    def replace_in_text(text: str) -> tuple[str, bool]:
-        """Try to replace continuation instructions. Returns (new_text, was_replaced)."""
-        # Check for polluted version first (more specific, longer match)
-        if CONTINUATION_INSTRUCTION_POLLUTED in text:
-            return text.replace(CONTINUATION_INSTRUCTION_POLLUTED, CONTINUATION_INSTRUCTION_ALPHA), True
-        # Then check for original SDK version (first-time compactions)
-        if CONTINUATION_INSTRUCTION_ORIGINAL in text:
-            return text.replace(CONTINUATION_INSTRUCTION_ORIGINAL, CONTINUATION_INSTRUCTION_ALPHA), True
-        return text, False
-
     for msg_idx, message in enumerate(messages):
         if message.get("role") != "user":
             continue
 
+        user_message_count += 1
         content = message.get("content")
-        logger.debug(f"[Phase 3] Checking user message {msg_idx}, content type: {type(content).__name__}")
 
         if isinstance(content, str):
-            new_content, replaced = replace_in_text(content)
+            new_content, replaced = _replace_continuation_in_text(content)
             if replaced:
                 message["content"] = new_content
                 replacements_made += 1
-                logger.info(f"[Phase 3] ✓ Replaced continuation instruction in message {msg_idx} (string content)")
+                logger.info("[Phase 3] ✓ Replaced continuation instruction in message %s (string content)", msg_idx)
 
         elif isinstance(content, list):
-            logger.debug(f"[Phase 3] Message {msg_idx} has {len(content)} content blocks")
             for block_idx, block in enumerate(content):
                 if not isinstance(block, dict) or block.get("type") != "text":
                     continue
 
                 text = block.get("text", "")
-                new_text, replaced = replace_in_text(text)
+                new_text, replaced = _replace_continuation_in_text(text)
                 if replaced:
                     block["text"] = new_text
                     replacements_made += 1
-                    logger.info(f"[Phase 3] ✓ Replaced continuation instruction in message {msg_idx} block {block_idx}")
+                    logger.info("[Phase 3] ✓ Replaced continuation instruction in message %s block %s", msg_idx, block_idx)
 
     if replacements_made == 0:
-        logger.debug("[Phase 3] No continuation instructions found in any user message")
+        logger.debug("[Phase 3] No continuation instructions found in %s user messages", user_message_count)
     else:
-        logger.info(f"[Phase 3] Total replacements made: {replacements_made}")
+        logger.info("[Phase 3] Total replacements made: %s", replacements_made)
@@ -13,6 +13,7 @@ just hints the rest of the time.
 """
 
 import logging
+import time
 from pathlib import Path
 
 import frontmatter
@@ -23,6 +24,16 @@ logger = logging.getLogger(__name__)
 CONTEXT_ROOT = Path("/Pondside")
 CONTEXT_FILE_NAME = "ALPHA.md"
 
+# Walking all of /Pondside is the expensive part, so the list of files is
+# reused for this many seconds. New ALPHA.md files show up after at most this.
+RESCAN_INTERVAL = 60.0
+
+# Cached state: (scanned_at, paths), path -> (mtime_ns, block, hint), and
+# the assembled result keyed on every file's (path, mtime_ns)
+_scan_cache: tuple[float, list[Path]] | None = None
+_file_cache: dict[Path, tuple[int, dict | None, str | None]] = {}
+_result_cache: tuple[tuple, tuple[list[dict], list[str]]] | None = None
+
 
 def find_context_files(root: Path = CONTEXT_ROOT) -> list[Path]:
     """Walk directory tree finding ALPHA.md files.
@@ -30,7 +41,7 @@ def find_context_files(root: Path = CONTEXT_ROOT) -> list[Path]:
     Returns paths sorted alphabetically for consistent ordering.
     """
     if not root.exists():
-        logger.warning(f"Context root does not exist: {root}")
+        logger.warning("Context root does not exist: %s", root)
         return []
 
     context_files = []
@@ -41,47 +52,97 @@ def find_context_files(root: Path = CONTEXT_ROOT) -> list[Path]:
     return sorted(context_files)
 
 
+def _cached_context_files() -> list[Path]:
+    """find_context_files(), rescanned at most every RESCAN_INTERVAL seconds."""
+    global _scan_cache
+
+    now = time.monotonic()
+    if _scan_cache is not None and now - _scan_cache[0] < RESCAN_INTERVAL:
+        return _scan_cache[1]
+
+    paths = find_context_files()
+    _scan_cache = (now, paths)
+    return paths
+
+
+def _load_file(path: Path) -> tuple[dict | None, str | None]:
+    """Parse one ALPHA.md into (full block, hint); either may be None."""
+    post = frontmatter.load(path)
+
+    # Get autoload value, default to "no"
+    autoload = str(post.metadata.get("autoload", "no")).lower()
+    when = post.metadata.get("when", "")
+
+    # Make path relative to /Pondside for cleaner display
+    rel_path = path.relative_to(CONTEXT_ROOT)
+
+    if autoload == "all":
+        # Full content injection
+        logger.debug("Loaded full context from %s", rel_path)
+        return {"path": str(rel_path), "content": post.content.strip()}, None
+
+    if autoload == "when" and when:
+        # Directive hint with clear trigger conditions
+        logger.debug("Added context hint for %s", rel_path)
+        return None, f"`Read({rel_path})` — **Topics:** {when}"
+
+    # autoload: no (or anything else) -> skip silently
+    return None, None
+
+
 def load_context() -> tuple[list[dict], list[str]]:
     """Load ALPHA.md files and return content blocks and hints.
 
+    Files are only re-read when their mtime changes, and while none has
+    changed the previous result is returned as is (callers must not mutate
+    it). Blocking (directory walk, stat, file reads) - call it from a thread
+    on the request path.
+
     Returns:
         (all_blocks, when_hints) where:
         - all_blocks: list of {"path": str, "content": str} for autoload=all files
         - when_hints: list of "Read({path}) when {when}" strings
     """
-    all_blocks = []
-    when_hints = []
+    global _result_cache
 
-    for path in find_context_files():
+    # Version key: every file's mtime. stat() is cheap next to a YAML parse.
+    stamps = []
+    for path in _cached_context_files():
         try:
-            post = frontmatter.load(path)
-
-            # Get autoload value, default to "no"
-            autoload = str(post.metadata.get("autoload", "no")).lower()
-            when = post.metadata.get("when", "")
-
-            # Make path relative to /Pondside for cleaner display
-            rel_path = path.relative_to(CONTEXT_ROOT)
+            stamps.append((path, path.stat().st_mtime_ns))
+        except FileNotFoundError:
+            # Deleted since the last scan
+            _file_cache.pop(path, None)
+        except Exception as e:
+            logger.warning("Failed to load context file %s: %s", path, e)
+    key = tuple(stamps)
 
-            if autoload == "all":
-                # Full content injection
-                all_blocks.append({
-                    "path": str(rel_path),
-                    "content": post.content.strip(),
-                })
-                logger.debug(f"Loaded full context from {rel_path}")
+    if _result_cache is not None and _result_cache[0] == key:
+        return _result_cache[1]
 
-            elif autoload == "when" and when:
-                # Directive hint with clear trigger conditions
-                when_hints.append(f"`Read({rel_path})` — **Topics:** {when}")
-                logger.debug(f"Added context hint for {rel_path}")
+    all_blocks = []
+    when_hints = []
 
-            # autoload: no (or anything else) -> skip silently
+    for path, mtime_ns in stamps:
+        try:
+            cached = _file_cache.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                block, hint = cached[1], cached[2]
+            else:
+                block, hint = _load_file(path)
+                _file_cache[path] = (mtime_ns, block, hint)
+
+            if block is not None:
+                all_blocks.append(block)
+            elif hint is not None:
+                when_hints.append(hint)
 
         except Exception as e:
-            logger.warning(f"Failed to load context file {path}: {e}")
+            logger.warning("Failed to load context file %s: %s", path, e)
 
     if all_blocks or when_hints:
-        logger.info(f"Loaded {len(all_blocks)} full context(s), {len(when_hints)} hint(s)")
+        logger.info("Loaded %s full context(s), %s hint(s)", len(all_blocks), len(when_hints))
 
-    return all_blocks, when_hints
+    result = (all_blocks, when_hints)
+    _result_cache = (key, result)
+    return result
@@ -7,7 +7,6 @@ Past (today): running summary of today's events
 All fetched from Redis keys populated by Pulse.
 """
 
-import asyncio
 import logging
 import os
 from dataclasses import dataclass
@@ -17,6 +16,18 @@ import redis.asyncio as redis
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://alpha-pi:6379")
+_redis: redis.Redis | None = None
+
+# Redis keys in HUDData field order
+HUD_KEYS = (
+    "hud:weather",
+    "hud:calendar",
+    "hud:todos",
+    "systemprompt:past:to_self",
+    "systemprompt:past:to_self:time",
+    "systemprompt:past:today",
+    "systemprompt:past:today:time",
+)
 
 
 @dataclass
@@ -31,44 +42,31 @@ class HUDData:
     today_so_far_time: str | None = None  # Timestamp for header formatting
 
 
-async def _get_redis() -> redis.Redis:
-    """Get async Redis connection."""
-    return redis.from_url(REDIS_URL, decode_responses=True)
+def _get_redis() -> redis.Redis:
+    """Get or create the async Redis client.
+
+    Shared across requests so its connection pool stays warm - no connect
+    and teardown per fetch.
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(REDIS_URL, decode_responses=True)
+    return _redis
 
 
 async def fetch() -> HUDData:
     """Fetch HUD data from Redis.
 
-    All fetches happen in parallel for speed.
-    Returns HUDData with None for any failed/missing values.
+    All keys come back in a single MGET round trip.
+    Returns HUDData with None for any missing values, or an empty HUDData
+    if Redis fails.
     """
     try:
-        r = await _get_redis()
-
-        # Parallel fetches
-        weather, calendar, todos, to_self, to_self_time, today_so_far, today_so_far_time = await asyncio.gather(
-            r.get("hud:weather"),
-            r.get("hud:calendar"),
-            r.get("hud:todos"),
-            r.get("systemprompt:past:to_self"),
-            r.get("systemprompt:past:to_self:time"),
-            r.get("systemprompt:past:today"),
-            r.get("systemprompt:past:today:time"),
-            return_exceptions=True,
-        )
-
-        await r.aclose()
-
-        # Convert exceptions to None
-        return HUDData(
-            weather=weather if not isinstance(weather, Exception) else None,
-            calendar=calendar if not isinstance(calendar, Exception) else None,
-            todos=todos if not isinstance(todos, Exception) else None,
-            to_self=to_self if not isinstance(to_self, Exception) else None,
-            to_self_time=to_self_time if not isinstance(to_self_time, Exception) else None,
-            today_so_far=today_so_far if not isinstance(today_so_far, Exception) else None,
-            today_so_far_time=today_so_far_time if not isinstance(today_so_far_time, Exception) else None,
-        )
+        r = _get_redis()
+
+        # One MGET for everything; missing keys come back as None
+        values = await r.mget(HUD_KEYS)
+        return HUDData(*values)
     except Exception as e:
-        logger.warning(f"Error fetching HUD data: {e}")
+        logger.warning("Error fetching HUD data: %s", e)
         return HUDData()
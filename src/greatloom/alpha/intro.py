@@ -13,11 +13,21 @@ import redis.asyncio as redis
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://alpha-pi:6379")
+_redis: redis.Redis | None = None
 
+INTRO_HEADER = "Alpha, this is your inner voice. Store these now:\n"
 
-async def _get_redis() -> redis.Redis:
-    """Get async Redis connection."""
-    return redis.from_url(REDIS_URL, decode_responses=True)
+
+def _get_redis() -> redis.Redis:
+    """Get or create the async Redis client.
+
+    Shared across requests so its connection pool stays warm - no connect
+    and teardown per fetch.
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(REDIS_URL, decode_responses=True)
+    return _redis
 
 
 async def get_memorables(session_id: str) -> list[str]:
@@ -33,18 +43,17 @@ async def get_memorables(session_id: str) -> list[str]:
         return []
 
     try:
-        r = await _get_redis()
+        r = _get_redis()
         key = f"intro:memorables:{session_id}"
         memorables = await r.lrange(key, 0, -1)
-        await r.aclose()
 
         if memorables:
-            logger.debug(f"Found {len(memorables)} memorables for session {session_id[:8]}")
+            logger.debug("Found %s memorables for session %s", len(memorables), session_id[:8])
         else:
-            logger.warning(f"No memorables for session {session_id[:8]}")
+            logger.warning("No memorables for session %s", session_id[:8])
         return memorables
     except Exception as e:
-        logger.error(f"Error reading memorables: {e}")
+        logger.error("Error reading memorables: %s", e)
         return []
 
 
@@ -60,26 +69,13 @@ def format_block(memorables: list[str]) -> str:
     if not memorables:
         return ""
 
-    # Clean up memorables - strip backticks and empty lines
-    cleaned = []
-    for mem in memorables:
-        mem = mem.strip()
-        # Skip empty lines and lone backticks
-        if not mem or mem == "```":
-            continue
-        # Strip leading/trailing backticks from the whole string
-        mem = mem.strip("`")
-        if mem:
-            cleaned.append(mem)
-
-    if not cleaned:
+    # Clean up memorables - strip whitespace, then backticks. Empty lines and
+    # lone ``` fences come out empty and are dropped.
+    lines = [f"- {mem}" for mem in (m.strip().strip("`") for m in memorables) if mem]
+    if not lines:
         return ""
 
-    lines = ["Alpha, this is your inner voice. Store these now:"]
-    for mem in cleaned:
-        lines.append(f"- {mem}")
-
-    return "\n".join(lines)
+    return INTRO_HEADER + "\n".join(lines)
 
 
 def inject_as_final_message(body: dict, session_id: str, block: str) -> None:
@@ -107,4 +103,4 @@ def inject_as_final_message(body: dict, session_id: str, block: str) -> None:
         "content": [{"type": "text", "text": block}],
     })
 
-    logger.info(f"Injected Intro as final message for session {session_id[:8]}")
+    logger.info("Injected Intro as final message for session %s", session_id[:8])
@@ -9,8 +9,10 @@ The flow: user says something → memories remind me of context → I respond.
 Attention recency means memories closer to response generation might help.
 """
 
+import functools
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Any
 
 import pendulum
@@ -27,26 +29,43 @@ def format_relative_time(created_at: str) -> str:
         "2026-01-20T12:00:00Z" → "6 days ago"
         "2025-12-15T08:00:00Z" → "Mon Dec 15 2025"
     """
+    return _format_relative_time(created_at, int(time.time() // 60))
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_relative_time(created_at: str, minute: int) -> str:
+    """format_relative_time() as of the given minute since the epoch.
+
+    Memories resurface turn after turn, so within a minute each timestamp
+    is parsed and formatted once. Same stdlib path as the inline formatter
+    in alpha/__init__.py: days are calendar days in the memory's timezone.
+    """
     try:
-        # Parse the timestamp
-        dt = pendulum.parse(created_at)
-        now = pendulum.now(dt.timezone or "America/Los_Angeles")
-
-        # Calculate the difference
-        diff = now.diff(dt)
-
-        if diff.in_days() == 0:
-            return f"today at {dt.format('h:mm A')}"
-        elif diff.in_days() == 1:
-            return f"yesterday at {dt.format('h:mm A')}"
-        elif diff.in_days() < 7:
-            return f"{diff.in_days()} days ago"
-        elif diff.in_days() < 30:
-            weeks = diff.in_days() // 7
+        # Parse the timestamp; pendulum only for what fromisoformat rejects
+        try:
+            dt = datetime.fromisoformat(created_at)
+        except ValueError:
+            dt = pendulum.parse(created_at)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+
+        # Calculate the difference in calendar days
+        today = datetime.fromtimestamp(minute * 60, dt.tzinfo).date()
+        days = abs((today - dt.date()).days)
+        clock = f"{dt.hour % 12 or 12}:{dt:%M %p}"  # "h:mm A"
+
+        if days == 0:
+            return f"today at {clock}"
+        elif days == 1:
+            return f"yesterday at {clock}"
+        elif days < 7:
+            return f"{days} days ago"
+        elif days < 30:
+            weeks = days // 7
             return f"{weeks} week{'s' if weeks > 1 else ''} ago"
         else:
-            # Use PSO-8601 format for older memories
-            return dt.format("ddd MMM D YYYY")
+            # Use PSO-8601 format for older memories ("ddd MMM D YYYY")
+            return f"{dt:%a %b} {dt.day} {dt.year}"
 
     except Exception as e:
         logger.warning(f"Failed to parse timestamp '{created_at}': {e}")
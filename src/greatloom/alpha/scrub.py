@@ -27,6 +27,10 @@ EXACT_NOISE_BLOCKS = [
     },
 ]
 
+# Their texts, so most blocks are ruled out by one set lookup instead of a
+# dict comparison against every entry
+NOISE_TEXTS = frozenset(b["text"] for b in EXACT_NOISE_BLOCKS)
+
 # Substrings that get removed from block text (compiled regexes)
 # These patterns have fixed structure with variable content in specific slots
 SCRUB_PATTERNS = [
@@ -57,6 +61,19 @@ SCRUB_PATTERNS = [
     ),
 ]
 
+# All of the above as one alternation, so each text is scanned once
+SCRUB_PATTERN = re.compile("|".join(p.pattern for p in SCRUB_PATTERNS), re.DOTALL)
+
+# Every pattern starts with this; texts without it can't match
+SCRUB_MARKER = "<system-reminder>"
+
+
+def _scrub_text(text: str) -> str:
+    """Remove SCRUB_PATTERN matches from text, skipping the regex when none can occur."""
+    if SCRUB_MARKER not in text:
+        return text
+    return SCRUB_PATTERN.sub("", text)
+
 
 def scrub_noise(body: dict) -> dict:
     """Remove noise blocks and substrings from the request body.
@@ -81,7 +98,10 @@ def scrub_noise(body: dict) -> dict:
 
         # Phase 1: Remove exact-match noise blocks
         original_len = len(content)
-        content = [block for block in content if block not in EXACT_NOISE_BLOCKS]
+        content = [
+            block for block in content
+            if not (block.get("text") in NOISE_TEXTS and block in EXACT_NOISE_BLOCKS)
+        ]
         removed = original_len - len(content)
         total_removed += removed
 
@@ -90,8 +110,7 @@ def scrub_noise(body: dict) -> dict:
             if block.get("type") == "text":
                 text = block.get("text", "")
                 original_text = text
-                for pattern in SCRUB_PATTERNS:
-                    text = pattern.sub("", text)
+                text = _scrub_text(text)
                 if text != original_text:
                     block["text"] = text
                     total_scrubbed += 1
@@ -103,15 +122,13 @@ def scrub_noise(body: dict) -> dict:
                         if nested_block.get("type") == "text":
                             text = nested_block.get("text", "")
                             original_text = text
-                            for pattern in SCRUB_PATTERNS:
-                                text = pattern.sub("", text)
+                            text = _scrub_text(text)
                             if text != original_text:
                                 nested_block["text"] = text
                                 total_scrubbed += 1
                 elif isinstance(nested, str):
                     original_text = nested
-                    for pattern in SCRUB_PATTERNS:
-                        nested = pattern.sub("", nested)
+                    nested = _scrub_text(nested)
                     if nested != original_text:
                         block["content"] = nested
                         total_scrubbed += 1
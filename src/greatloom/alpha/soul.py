@@ -37,6 +37,7 @@ COMPACT_FILE = "compact-prompt.md"
 # === Cached State ===
 
 _soul_prompt: str | None = None
+_soul_block: str | None = None  # Soul doc with its "# Alpha" header, built once
 _soul_commit: str | None = None
 _compact_prompt: str | None = None
 _compact_commit: str | None = None
@@ -116,7 +117,7 @@ def init() -> None:
 
     Call this once during application startup.
     """
-    global _soul_prompt, _soul_commit, _compact_prompt, _compact_commit
+    global _soul_prompt, _soul_block, _soul_commit, _compact_prompt, _compact_commit
 
     logger.info("Initializing Alpha soul...")
     logger.info(f"  Repository: {SOUL_REPO_PATH}")
@@ -132,6 +133,7 @@ def init() -> None:
             f"Is the git repository present and accessible?"
         )
     _soul_prompt, _soul_commit = soul_result
+    _soul_block = f"# Alpha\n\n{_soul_prompt}"
 
     # Load compact prompt (optional, graceful degradation)
     compact_result = _read_from_git(COMPACT_FILE, COMPACT_REF)
@@ -156,6 +158,17 @@ def get_soul() -> str:
     return _soul_prompt
 
 
+def get_soul_block() -> str:
+    """Get the soul doc as system block text, header included.
+
+    Built once at init() so requests don't re-concatenate a multi-KB
+    string that never changes.
+    """
+    if _soul_block is None:
+        raise RuntimeError("Soul not initialized. Call soul.init() first.")
+    return _soul_block
+
+
 def get_compact() -> str | None:
     """Get the cached compact prompt, or None if not loaded."""
     return _compact_prompt
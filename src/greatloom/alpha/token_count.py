@@ -6,19 +6,20 @@ and stashes the result in Redis for Duckpond to display.
 Fire-and-forget: this runs in a background task and doesn't block requests.
 """
 
-import asyncio
 import json
 import logging
 import os
 from typing import Any
 
 import httpx
-import redis
+import orjson
+import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
 # Redis connection for stashing results
 REDIS_URL = os.environ.get("REDIS_URL", "redis://alpha-pi:6379")
+_redis: redis.Redis | None = None
 
 # Anthropic API for token counting
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
@@ -59,10 +60,14 @@ async def count_and_stash(body: dict[str, Any], session_id: str) -> None:
         if "tools" in body:
             count_body["tools"] = body["tools"]
 
+        # Serialize with orjson ourselves rather than letting httpx's json=
+        # run the stdlib encoder over the whole transcript
+        content = orjson.dumps(count_body)
+
         async with httpx.AsyncClient(timeout=10.0) as client:
             response = await client.post(
                 ANTHROPIC_API_URL,
-                json=count_body,
+                content=content,
                 headers={
                     "x-api-key": ANTHROPIC_API_KEY,
                     "anthropic-version": "2023-06-01",
@@ -89,23 +94,26 @@ async def count_and_stash(body: dict[str, Any], session_id: str) -> None:
         logger.warning(f"Token count failed: {e}")
 
 
+def _get_redis() -> redis.Redis:
+    """Get or create the async Redis client, so stashes reuse its connection pool."""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(REDIS_URL)
+    return _redis
+
+
 async def _stash_to_redis(session_id: str, input_tokens: int) -> None:
     """Stash token count in Redis for Duckpond to read.
 
     Uses the same key format as the old Eavesdrop: duckpond:context:{session_id}
     """
     try:
-        # Use sync redis in a thread pool to avoid blocking
-        def _sync_stash():
-            r = redis.from_url(REDIS_URL)
-            data = json.dumps({
-                "input_tokens": input_tokens,
-                "timestamp": None,  # Could add pendulum.now() if we want
-            })
-            # Expire after 1 hour - if session is stale, don't keep the data
-            r.set(f"duckpond:context:{session_id}", data, ex=3600)
-
-        await asyncio.to_thread(_sync_stash)
+        data = json.dumps({
+            "input_tokens": input_tokens,
+            "timestamp": None,  # Could add pendulum.now() if we want
+        })
+        # Expire after 1 hour - if session is stale, don't keep the data
+        await _get_redis().set(f"duckpond:context:{session_id}", data, ex=3600)
 
     except Exception as e:
         logger.warning(f"Failed to stash token count to Redis: {e}")
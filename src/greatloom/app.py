@@ -3,19 +3,25 @@
 Where Claude becomes whoever you need.
 """
 
-import json
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import logfire
+import orjson
 from opentelemetry import trace
 
 from .router import init_patterns, get_pattern_from_request
-from .metadata import extract_and_strip_metadata
+from .metadata import DELIVERATOR_CANARY_BYTES, extract_metadata_from_bytes
+from .patterns import PassthroughPattern
 from . import proxy, quota
 
+# Request bodies above this size are decoded/encoded in a worker thread
+LARGE_BODY_BYTES = 64 * 1024
+
 # Suppress harmless OTel context warnings before they're configured
 logging.getLogger("opentelemetry.context").setLevel(logging.CRITICAL)
 
@@ -36,6 +42,7 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
     logfire.info("The Great Loom is starting up...")
     init_patterns()
+    await proxy.warmup()
     logfire.info("The Great Loom is ready.")
     yield
     logfire.info("The Great Loom is shutting down...")
@@ -59,98 +66,164 @@ async def health():
     return {"status": "ok", "service": "greatloom"}
 
 
+def _decode_body(body_bytes: bytes) -> tuple[dict | None, dict | None, bytes, bool]:
+    """Parse the raw body bytes and extract metadata from them.
+
+    Metadata contains memories, session info, etc. from the hook. Most
+    requests carry no canary at all, so a cheap bytes scan decides whether
+    extraction runs.
+
+    Returns (body, metadata, body_bytes, bytes_stale). body_bytes has the
+    metadata blocks rewritten to match body; bytes_stale means they couldn't
+    be and body has to be re-serialized before going upstream.
+    """
+    body = None
+    try:
+        body = orjson.loads(body_bytes)
+    except orjson.JSONDecodeError:
+        logfire.warning("Failed to parse request body as JSON")
+        return body, None, body_bytes, False
+
+    metadata = None
+    bytes_stale = False
+
+    if DELIVERATOR_CANARY_BYTES in body_bytes:
+        metadata, body, spliced = extract_metadata_from_bytes(body, body_bytes)
+        if spliced is None:
+            bytes_stale = True
+        else:
+            body_bytes = spliced
+
+    return body, metadata, body_bytes, bytes_stale
+
+
+def _record_error(span: trace.Span, e: Exception) -> None:
+    """Record a request failure on its span and in the error log."""
+    span.record_exception(e)
+    logfire.error("Loom error", error=str(e))
+
+
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def handle_request(request: Request, path: str):
     """Route requests through the appropriate pattern."""
 
-    body_bytes = await request.body()
     headers = dict(request.headers)
+    is_messages_endpoint = request.method == "POST" and "messages" in path
+
+    # Only messages endpoints get transformed. Anything else with a body is
+    # streamed to upstream as it arrives instead of being buffered first.
+    has_upload = "content-length" in headers or "transfer-encoding" in headers
+    stream_upload = has_upload and not is_messages_endpoint
+    body_bytes = b"" if stream_upload else await request.body()
 
     # Parse body for pattern selection and transformation
     body = None
-    is_messages_endpoint = request.method == "POST" and "messages" in path
+
+    metadata = None
+    bytes_stale = False
+
+    # The current span is created by instrument_fastapi
+    current_span = trace.get_current_span()
 
     if is_messages_endpoint and body_bytes:
+        # Long conversations run to megabytes; keep that work off the event loop
         try:
-            body = json.loads(body_bytes)
-        except json.JSONDecodeError:
-            logfire.warning("Failed to parse request body as JSON")
+            if len(body_bytes) > LARGE_BODY_BYTES:
+                decoded = await asyncio.to_thread(_decode_body, body_bytes)
+            else:
+                decoded = _decode_body(body_bytes)
+        except Exception as e:
+            # Metadata extraction happens here, so record it like the main block
+            _record_error(current_span, e)
+            raise
+        body, metadata, body_bytes, bytes_stale = decoded
 
     # Select pattern
     pattern = get_pattern_from_request(headers, body or {})
     pattern_name = type(pattern).__name__
 
-    # Extract model and session for span attributes
+    # Extract model and session for span attributes (looked up once)
     model = body.get("model", "unknown") if body else "unknown"
-    session_id = headers.get("x-session-id", "")
-
-    # === Get the current span (created by instrument_fastapi) and attach attributes ===
-    # No manual span creation - we enrich the existing FastAPI span
-    current_span = trace.get_current_span()
-    if current_span.is_recording():
+    message_count = len(body.get("messages", ())) if body else 0
+    session_id = headers.get("x-session-id")
+    session_short = session_id[:8] if session_id else "none"
+
+    # === Attach attributes to the current span ===
+    # No manual span creation - we enrich the existing FastAPI span.
+    # Non-recording spans still build attribute keys, so skip them outright.
+    is_recording = current_span.is_recording()
+    if is_recording:
         current_span.set_attribute("pattern", pattern_name)
         current_span.set_attribute("model", model)
         current_span.set_attribute("endpoint", f"/{path}")
         if session_id:
-            current_span.set_attribute("session.id", session_id[:8])
+            current_span.set_attribute("session.id", session_short)
 
     logfire.info(
-        f"{pattern_name} request ({model}): {len(body.get('messages', []))} messages" if body else f"{pattern_name} request",
+        f"{pattern_name} request ({model}): {message_count} messages" if body else f"{pattern_name} request",
         pattern=pattern_name,
         model=model,
-        session=session_id[:8] if session_id else "none",
-        message_count=len(body.get("messages", [])) if body else 0,
+        session=session_short,
+        message_count=message_count,
     )
 
     try:
-        # Extract and strip metadata from body
-        # Metadata contains memories, session info, etc. from the hook
-        metadata = None
-        if body is not None:
-            metadata, body = extract_and_strip_metadata(body)
-
         # Transform request (pass metadata to pattern)
         if body is not None:
             headers, body = await pattern.request(headers, body, metadata)
-            body_bytes = json.dumps(body).encode()
+            # Passthrough never touches the body, so unless the metadata
+            # rewrite couldn't be mirrored in the bytes they can go upstream as-is
+            if bytes_stale or not isinstance(pattern, PassthroughPattern):
+                if len(body_bytes) > LARGE_BODY_BYTES:
+                    body_bytes = await asyncio.to_thread(orjson.dumps, body)
+                else:
+                    body_bytes = orjson.dumps(body)
 
         # Forward to upstream
         forward_headers = proxy.filter_request_headers(headers)
+        if stream_upload and "content-length" in headers:
+            # Body is untouched, so the client's length still holds
+            # (and saves httpx from falling back to a chunked upload)
+            forward_headers["content-length"] = headers["content-length"]
 
         # Check if this is a streaming request
         is_streaming_request = body is not None and body.get("stream", False)
 
         if is_streaming_request:
             # === Streaming request - use true streaming ===
-            # We use client.stream() to avoid buffering the entire response
-
-            captured_span = current_span
-            captured_pattern = pattern
-
-            async def stream_with_transform():
-                stream_ctx = await proxy.stream_request(
-                    method=request.method,
-                    path=path,
-                    headers=forward_headers,
-                    content=body_bytes,
-                    params=dict(request.query_params),
-                )
-                async with stream_ctx as upstream_response:
-                    # Log quota from response headers
-                    quota.log_quota(dict(upstream_response.headers))
+            # Upstream's bytes go straight to StreamingResponse. The response
+            # hook runs as a background task once the stream finishes.
+            upstream_response = await proxy.open_stream(
+                method=request.method,
+                path=path,
+                headers=forward_headers,
+                content=body_bytes,
+                params=dict(request.query_params),
+            )
 
-                    captured_span.set_attribute("http.status_code", upstream_response.status_code)
+            # Log quota from response headers
+            quota.log_quota(upstream_response.headers)
 
+            if is_recording:
+                current_span.set_attribute("http.status_code", upstream_response.status_code)
+
+            async def relay_stream():
+                # Starlette skips the background task when the stream fails
+                # or the client goes away, so close upstream on every exit
+                try:
                     async for chunk in upstream_response.aiter_bytes():
                         yield chunk
+                finally:
+                    await upstream_response.aclose()
 
-                    # After streaming, call response hook (body=None for streams)
-                    response_headers = proxy.filter_response_headers(dict(upstream_response.headers))
-                    await captured_pattern.response(response_headers, None)
+            async def finish_stream():
+                # After streaming, call response hook (body=None for streams)
+                response_headers = proxy.filter_response_headers(upstream_response.headers)
+                await pattern.response(response_headers, None)
 
             return StreamingResponse(
-                stream_with_transform(),
-                status_code=200,  # Actual status comes from upstream
+                relay_stream(),
+                status_code=upstream_response.status_code,
                 headers={
                     "content-type": "text/event-stream",
                     "cache-control": "no-cache",
@@ -158,6 +231,7 @@ async def handle_request(request: Request, path: str):
                     "x-accel-buffering": "no",  # Disable nginx buffering
                 },
                 media_type="text/event-stream",
+                background=BackgroundTask(finish_stream),
             )
 
         else:
@@ -166,27 +240,28 @@ async def handle_request(request: Request, path: str):
                 method=request.method,
                 path=path,
                 headers=forward_headers,
-                content=body_bytes,
+                content=request.stream() if stream_upload else body_bytes,
                 params=dict(request.query_params),
             )
 
             # Log quota information to Redis (for Alpha Energy dashboard)
-            quota.log_quota(dict(upstream_response.headers))
+            quota.log_quota(upstream_response.headers)
 
             # Prepare response
-            response_headers = proxy.filter_response_headers(dict(upstream_response.headers))
+            response_headers = proxy.filter_response_headers(upstream_response.headers)
             status_code = upstream_response.status_code
             response_content = upstream_response.content
 
-            current_span.set_attribute("http.status_code", status_code)
+            if is_recording:
+                current_span.set_attribute("http.status_code", status_code)
 
             try:
-                response_body = json.loads(response_content)
+                response_body = orjson.loads(response_content)
                 response_headers, response_body = await pattern.response(
                     response_headers, response_body
                 )
-                response_content = json.dumps(response_body).encode()
-            except json.JSONDecodeError:
+                response_content = orjson.dumps(response_body)
+            except orjson.JSONDecodeError:
                 # Not JSON, just pass through
                 await pattern.response(response_headers, None)
 
@@ -197,6 +272,5 @@ async def handle_request(request: Request, path: str):
             )
 
     except Exception as e:
-        current_span.record_exception(e)
-        logfire.error("Loom error", error=str(e))
+        _record_error(current_span, e)
         raise
@@ -13,139 +13,269 @@ Flow:
 This module handles the extraction and transformation.
 """
 
-import json
 import logging
+import re
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 # The canary that marks our metadata block
 DELIVERATOR_CANARY = "DELIVERATOR_METADATA_UlVCQkVSRFVDSw"
+# Prescreen for raw request bodies. A plain `in` on the full canary is already
+# CPython's fastsearch, and a longer needle skips further per mismatch - a
+# short-prefix check first measured ~3x slower on a 12 MB body, not faster.
+DELIVERATOR_CANARY_BYTES = DELIVERATOR_CANARY.encode()
 
+# Real hook output has "hook additional context:" within the first 100 chars,
+# followed by the JSON object. One search finds the marker and the JSON span
+# without lowercasing a copy of the whole text.
+_HOOK_METADATA_RE = re.compile(
+    r"\A.{0,100}?hook additional context:.*?(\{.*\})",
+    re.DOTALL | re.IGNORECASE,
+)
 
-def extract_metadata(body: dict) -> tuple[dict | None, dict]:
+
+def _enclosing_string(body_bytes: bytes, pos: int) -> tuple[int, int] | None:
+    """Find the JSON string literal containing byte offset `pos`.
+
+    Returns (start, end) such that body_bytes[start:end] is the literal,
+    quotes included, or None if no unescaped quotes surround `pos`.
+    """
+
+    def is_escaped(quote_pos: int) -> bool:
+        backslashes = 0
+        i = quote_pos - 1
+        while i >= 0 and body_bytes[i] == 0x5C:  # backslash
+            backslashes += 1
+            i -= 1
+        return backslashes % 2 == 1
+
+    start = body_bytes.rfind(b'"', 0, pos)
+    while start != -1 and is_escaped(start):
+        start = body_bytes.rfind(b'"', 0, start)
+    if start == -1:
+        return None
+
+    end = body_bytes.find(b'"', pos)
+    while end != -1 and is_escaped(end):
+        end = body_bytes.find(b'"', end + 1)
+    if end == -1:
+        return None
+
+    return start, end + 1
+
+
+def _parse_metadata_text(text: str) -> dict | None:
+    """Parse hook output text into metadata, or None if it isn't metadata."""
+    # Must be actual metadata, not code mentioning the canary
+    match = _HOOK_METADATA_RE.search(text)
+    if match is None:
+        return None
+
+    try:
+        block_metadata = orjson.loads(match.group(1))
+    except orjson.JSONDecodeError:
+        return None
+
+    # Verify it's actual metadata
+    if not isinstance(block_metadata, dict) or "canary" not in block_metadata:
+        return None
+
+    return block_metadata
+
+
+def _splice_metadata_bytes(body_bytes: bytes) -> tuple[bytes, int] | None:
+    """Rewrite every metadata string in the raw request bytes to its timestamp.
+
+    Finds each canary with bytes.find(), decodes just the JSON string that
+    encloses it, and splices the "[Sent ...]" timestamp in as a new string
+    literal. This sees every JSON string holding the canary, wherever it
+    sits in the body - it can't tell user text from assistant text or tool
+    results, so extract_metadata_from_bytes() checks it against the dict walk.
+
+    Returns None when a metadata block has no sent_at: that block has to be
+    removed outright, which only the dict walk can do.
+
+    Returns:
+        (transformed_bytes, transforms) or None
+    """
+    pieces = []
+    copied_to = 0
+    transforms = 0
+
+    pos = body_bytes.find(DELIVERATOR_CANARY_BYTES)
+    while pos != -1:
+        span = _enclosing_string(body_bytes, pos)
+        if span is None:
+            return None
+        start, end = span
+
+        try:
+            text = orjson.loads(body_bytes[start:end])
+        except orjson.JSONDecodeError:
+            return None
+
+        block_metadata = _parse_metadata_text(text)
+        if block_metadata is not None:
+            sent_at = block_metadata.get("sent_at", "")
+            if not sent_at:
+                return None
+            pieces.append(body_bytes[copied_to:start])
+            pieces.append(orjson.dumps(f"[Sent {sent_at}]"))
+            copied_to = end
+            transforms += 1
+
+        # Skip any further canaries inside the same string
+        pos = body_bytes.find(DELIVERATOR_CANARY_BYTES, end)
+
+    if not transforms:
+        return body_bytes, 0
+
+    pieces.append(body_bytes[copied_to:])
+    return b"".join(pieces), transforms
+
+
+def extract_metadata_from_bytes(body: dict, body_bytes: bytes) -> tuple[dict | None, dict, bytes | None]:
+    """extract_metadata(), keeping the raw request bytes in step with the body.
+
+    `body` must be the parse of `body_bytes`. The dict walk stays the
+    authority on what is metadata; the same timestamps are also spliced into
+    the bytes so an untouched body can go upstream without re-serializing.
+
+    The splice rewrites every metadata string in the body, the walk only
+    those in user text. Each walk transform has its own string in the bytes,
+    so equal counts prove every splice landed in user text too. On any
+    mismatch (hook output quoted by the assistant or a tool, say) the bytes
+    are not trusted.
+
+    Args:
+        body: The parsed request body (modified in place)
+        body_bytes: The raw request body it was parsed from
+
+    Returns:
+        (metadata, transformed_body, transformed_bytes) - transformed_bytes
+        is None when it can't be shown to match and the body must be
+        re-serialized
+    """
+    metadata, body, transforms = _extract_metadata(body)
+    if not transforms:
+        return metadata, body, body_bytes
+
+    spliced = _splice_metadata_bytes(body_bytes)
+    if spliced is None or spliced[1] != transforms:
+        return metadata, body, None
+    return metadata, body, spliced[0]
+
+
+def _extract_metadata(body: dict) -> tuple[dict | None, dict, int]:
     """Extract metadata from body and transform metadata blocks to timestamps.
 
     Searches for text blocks containing the canary, extracts the JSON,
     then replaces each block with a human-readable timestamp.
 
-    Iterates top-to-bottom so the last (most recent) metadata wins.
+    Iterates bottom-to-top and transforms in the same pass. Invariant:
+    popping the current message or block only shifts entries we've already
+    visited, so indices ahead of us stay valid. The first metadata found
+    is therefore the last (most recent) one, and it wins.
 
     Args:
         body: The request body dict
 
     Returns:
-        (metadata, transformed_body) - metadata dict from last block (or None),
-        body with metadata blocks transformed to timestamps
+        (metadata, transformed_body, transforms) - metadata dict from last
+        block (or None), body with metadata blocks transformed to timestamps,
+        and how many blocks were transformed or removed
     """
     messages = body.get("messages", [])
     if not messages:
-        return None, body
+        return None, body, 0
 
     metadata = None
-    transforms = []  # List of (msg_idx, block_idx or None, sent_at) to apply
+    transforms = 0
 
-    # Search messages top-to-bottom, collect all canary blocks
-    for msg_idx, msg in enumerate(messages):
+    for msg_idx in range(len(messages) - 1, -1, -1):
+        msg = messages[msg_idx]
         if msg.get("role") != "user":
             continue
 
         content = msg.get("content")
 
         if isinstance(content, str):
-            if DELIVERATOR_CANARY in content:
-                # Must be actual metadata, not code mentioning the canary
-                # Real hook output has "hook additional context:" near the start
-                lower_content = content.lower()
-                hook_marker_pos = lower_content.find("hook additional context:")
-                if hook_marker_pos == -1 or hook_marker_pos > 100:
-                    continue
-                # Find the JSON
-                try:
-                    start = content.find("{")
-                    end = content.rfind("}") + 1
-                    if start != -1 and end > start:
-                        block_metadata = json.loads(content[start:end])
-                        # Verify it's actual metadata
-                        if "canary" not in block_metadata:
-                            continue
-                        sent_at = block_metadata.get("sent_at", "")
-                        transforms.append((msg_idx, None, sent_at))
-                        metadata = block_metadata
-                        logger.debug(f"Found metadata in message {msg_idx} (string content)")
-                except json.JSONDecodeError as e:
-                    logger.debug(f"Skipping non-metadata block: {e}")
+            if DELIVERATOR_CANARY not in content:
+                continue
+            block_metadata = _parse_metadata_text(content)
+            if block_metadata is None:
+                logger.debug("Skipping non-metadata canary in message %s", msg_idx)
+                continue
+            if metadata is None:
+                metadata = block_metadata
+            transforms += 1
+
+            sent_at = block_metadata.get("sent_at", "")
+            if sent_at:
+                # Entire message content is the metadata string
+                msg["content"] = f"[Sent {sent_at}]"
+                logger.debug("Transformed message %s to timestamp", msg_idx)
+            else:
+                # No sent_at in metadata - just remove the message
+                messages.pop(msg_idx)
+                logger.debug("Removed message %s (no sent_at)", msg_idx)
 
         elif isinstance(content, list):
-            for block_idx, block in enumerate(content):
+            removed_block = False
+            # Hook output is usually the last block, so pops are mostly O(1)
+            for block_idx in range(len(content) - 1, -1, -1):
+                block = content[block_idx]
                 if not isinstance(block, dict) or block.get("type") != "text":
                     continue
                 text = block.get("text", "")
-                if DELIVERATOR_CANARY in text:
-                    # Must be actual metadata, not code mentioning the canary
-                    lower_text = text.lower()
-                    hook_marker_pos = lower_text.find("hook additional context:")
-                    if hook_marker_pos == -1 or hook_marker_pos > 100:
-                        continue
-                    try:
-                        start = text.find("{")
-                        end = text.rfind("}") + 1
-                        if start != -1 and end > start:
-                            block_metadata = json.loads(text[start:end])
-                            # Verify it's actual metadata
-                            if "canary" not in block_metadata:
-                                continue
-                            sent_at = block_metadata.get("sent_at", "")
-                            transforms.append((msg_idx, block_idx, sent_at))
-                            metadata = block_metadata
-                            logger.debug(f"Found metadata in message {msg_idx} block {block_idx}")
-                    except json.JSONDecodeError as e:
-                        logger.debug(f"Skipping non-metadata block: {e}")
-
-    # Apply transforms - replace each metadata block with its timestamp
-    # Process in reverse order so indices stay valid
-    for msg_idx, block_idx, sent_at in reversed(transforms):
-        msg = messages[msg_idx]
+                if DELIVERATOR_CANARY not in text:
+                    continue
+                block_metadata = _parse_metadata_text(text)
+                if block_metadata is None:
+                    logger.debug("Skipping non-metadata canary in message %s block %s", msg_idx, block_idx)
+                    continue
+                if metadata is None:
+                    metadata = block_metadata
+                transforms += 1
 
-        if sent_at:
-            timestamp_text = f"[Sent {sent_at}]"
-        else:
-            # No sent_at in metadata - just remove the block
-            timestamp_text = None
-
-        if block_idx is None:
-            # Entire message content is the metadata string
-            if timestamp_text:
-                msg["content"] = timestamp_text
-                logger.debug(f"Transformed message {msg_idx} to timestamp")
-            else:
-                messages.pop(msg_idx)
-                logger.debug(f"Removed message {msg_idx} (no sent_at)")
-        else:
-            # Transform just the block
-            content = msg.get("content", [])
-            if isinstance(content, list) and block_idx < len(content):
-                if timestamp_text:
-                    content[block_idx]["text"] = timestamp_text
-                    logger.debug(f"Transformed block {block_idx} in message {msg_idx}")
+                sent_at = block_metadata.get("sent_at", "")
+                if sent_at:
+                    block["text"] = f"[Sent {sent_at}]"
+                    logger.debug("Transformed block %s in message %s", block_idx, msg_idx)
                 else:
                     content.pop(block_idx)
-                    # If message is now empty, remove it
-                    if not content:
-                        messages.pop(msg_idx)
-                        logger.debug(f"Removed empty message {msg_idx}")
-                    else:
-                        msg["content"] = content
-                        logger.debug(f"Removed block {block_idx} from message {msg_idx}")
-
-    if metadata:
+                    removed_block = True
+                    logger.debug("Removed block %s from message %s", block_idx, msg_idx)
+
+            # If message is now empty, remove it
+            if removed_block and not content:
+                messages.pop(msg_idx)
+                logger.debug("Removed empty message %s", msg_idx)
+
+    if metadata and logger.isEnabledFor(logging.INFO):
         session_id = metadata.get("session_id", "")
         logger.info(
-            f"Extracted metadata: session={session_id[:8] if session_id else 'none'}, "
-            f"memories={len(metadata.get('memories', []))}, "
-            f"transforms={len(transforms)}"
+            "Extracted metadata: session=%s, memories=%s, transforms=%s",
+            session_id[:8] if session_id else "none",
+            len(metadata.get("memories", [])),
+            transforms,
         )
 
+    return metadata, body, transforms
+
+
+def extract_metadata(body: dict) -> tuple[dict | None, dict]:
+    """Extract metadata from body and transform metadata blocks to timestamps.
+
+    See _extract_metadata().
+
+    Returns:
+        (metadata, transformed_body)
+    """
+    metadata, body, _ = _extract_metadata(body)
     return metadata, body
 
 
@@ -137,12 +137,9 @@ class IotaPattern:
             # Element 1 is the identity slot — replace with first prompt
             # Insert additional prompts after element 1
 
-            # Replace element 1 with first prompt
-            existing_system[1] = {"type": "text", "text": all_prompts[0]}
-
-            # Insert additional prompts after element 1
-            for i, prompt in enumerate(all_prompts[1:], start=2):
-                existing_system.insert(i, {"type": "text", "text": prompt})
+            # Replace element 1 with all our prompts in one slice assignment
+            # (one list shift instead of an insert() per prompt)
+            existing_system[1:2] = [{"type": "text", "text": prompt} for prompt in all_prompts]
 
             body["system"] = existing_system
 
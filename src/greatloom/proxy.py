@@ -1,13 +1,39 @@
 """HTTP proxy logic for forwarding requests to upstream (Argonath or Anthropic)."""
 
+import asyncio
+import logging
 import os
+import random
+from collections.abc import AsyncIterator, Mapping
 
 import httpx
 
+logger = logging.getLogger(__name__)
+
 # Where we forward to - Argonath in the full pipeline, or direct to Anthropic
 UPSTREAM_URL = os.environ.get("UPSTREAM_URL", "https://api.anthropic.com")
 
+# Connection pool sizing - LLM requests are long-lived, so the httpx defaults
+# (100 connections, 20 keepalive) run out under concurrent sessions.
+# Lower these to backpressure against upstream rate limits.
+MAX_CONNECTIONS = int(os.environ.get("LOOM_MAX_CONNECTIONS", "1000"))
+MAX_KEEPALIVE = int(os.environ.get("LOOM_MAX_KEEPALIVE", "100"))
+KEEPALIVE_EXPIRY = 90.0
+
+# Connections to open at startup so the first real request skips the handshake
+WARMUP_CONNECTIONS = int(os.environ.get("LOOM_WARMUP_CONNECTIONS", "4"))
+WARMUP_TIMEOUT = 5.0  # Startup waits on warmup, so don't give it the LLM timeout
+
+# Retries for transient upstream failures (rate limited / overloaded)
+MAX_RETRIES = int(os.environ.get("LOOM_MAX_RETRIES", "3"))
+RETRY_STATUSES = frozenset({429, 503, 529})
+MAX_RETRY_DELAY = 8.0  # Longest wait we retry after; a longer retry-after goes to the client
+
 # Persistent client for connection pooling
+# Deliberately httpx, not aiohttp: logfire.instrument_httpx() is what nests the
+# upstream call spans under each request's trace, and aiohttp can't speak the
+# HTTP/2 we multiplex concurrent streams over. Pool tuning (above) covers the
+# keepalive reuse aiohttp would otherwise buy us.
 _client: httpx.AsyncClient | None = None
 
 
@@ -18,10 +44,39 @@ async def get_client() -> httpx.AsyncClient:
         _client = httpx.AsyncClient(
             base_url=UPSTREAM_URL,
             timeout=httpx.Timeout(300.0, connect=10.0),  # Long timeout for LLM responses
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            http2=True,  # Multiplex concurrent streams over one TLS connection
         )
     return _client
 
 
+async def warmup(count: int = WARMUP_CONNECTIONS) -> None:
+    """Seed the keepalive pool with warm connections to upstream.
+
+    Fires cheap HEAD requests so TLS and HTTP/2 negotiation happen before
+    the first real request. Failures are logged and ignored - a cold pool
+    is still a working pool.
+    """
+    if count <= 0:
+        return
+
+    client = await get_client()
+    results = await asyncio.gather(
+        *(client.head("/", timeout=WARMUP_TIMEOUT) for _ in range(count)),
+        return_exceptions=True,
+    )
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning("Upstream warmup: %s/%s failed: %r", len(failures), count, failures[0])
+    else:
+        logger.info("Upstream warmup: %s connection(s) to %s", count, UPSTREAM_URL)
+
+
 async def close():
     """Close the HTTP client."""
     global _client
@@ -30,69 +85,127 @@ async def close():
         _client = None
 
 
+def _retry_delay(response: httpx.Response, attempt: int) -> float | None:
+    """Seconds to wait before retrying: retry-after if given, else exponential.
+
+    None when upstream asks for longer than MAX_RETRY_DELAY - that wait is
+    the client's call, not ours.
+    """
+    try:
+        delay = float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        delay = min(0.5 * 2 ** attempt, MAX_RETRY_DELAY)
+    else:
+        if delay > MAX_RETRY_DELAY:
+            return None
+    return delay + random.random() * 0.3
+
+
+async def _send_with_retry(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    stream: bool = False,
+    retryable: bool = True,
+) -> httpx.Response:
+    """Send a request, retrying transient 429/503/529s with jittered backoff.
+
+    Bodies that are streamed from the client can't be replayed, so callers
+    pass retryable=False for those.
+    """
+    attempt = 0
+    while True:
+        response = await client.send(request, stream=stream)
+        if not retryable or response.status_code not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+            return response
+
+        delay = _retry_delay(response, attempt)
+        if delay is None:
+            return response
+        await response.aclose()
+        attempt += 1
+        logger.warning(
+            "Upstream returned %s, retry %s/%s in %.1fs",
+            response.status_code, attempt, MAX_RETRIES, delay,
+        )
+        await asyncio.sleep(delay)
+
+
 async def forward_request(
     method: str,
     path: str,
     headers: dict,
-    content: bytes,
+    content: bytes | AsyncIterator[bytes],
     params: dict,
 ) -> httpx.Response:
-    """Forward a request to upstream (non-streaming)."""
+    """Forward a request to upstream (non-streaming).
+
+    `content` may be an async byte iterator (e.g. `request.stream()`), in
+    which case the upload is streamed through without buffering.
+    """
     client = await get_client()
-    return await client.request(
+    request = client.build_request(
         method=method,
         url=f"/{path}",
         headers=headers,
         content=content,
         params=params,
     )
+    return await _send_with_retry(client, request, retryable=isinstance(content, bytes))
 
 
-def stream_request(
+async def open_stream(
     method: str,
     path: str,
     headers: dict,
     content: bytes,
     params: dict,
-):
+) -> httpx.Response:
     """Forward a request to upstream with true streaming.
 
-    Returns a context manager that yields chunks as they arrive.
-    Must be used with `async with`:
+    Returns as soon as upstream sends its headers; the body is read lazily.
+    Hand `response.aiter_bytes()` straight to the client and `aclose()` the
+    response when done:
 
-        async with stream_request(...) as response:
+        response = await open_stream(...)
+        try:
             async for chunk in response.aiter_bytes():
-                yield chunk
+                ...
+        finally:
+            await response.aclose()
     """
-    # Get the client synchronously (it's cached after first call)
-    # This is a bit awkward but httpx.AsyncClient.stream() returns a context manager
-    import asyncio
-
-    async def get_stream():
-        client = await get_client()
-        return client.stream(
-            method=method,
-            url=f"/{path}",
-            headers=headers,
-            content=content,
-            params=params,
-        )
+    client = await get_client()
+    request = client.build_request(
+        method=method,
+        url=f"/{path}",
+        headers=headers,
+        content=content,
+        params=params,
+    )
+    return await _send_with_retry(client, request, stream=True)
 
-    # Return an awaitable that gives the context manager
-    return get_stream()
+
+# Headers we never forward, lowercased for direct membership tests
+_EXCLUDED_REQUEST_HEADERS = frozenset({"host", "content-length"})
+
+# Headers that no longer apply once httpx has auto-decompressed the body
+_EXCLUDED_RESPONSE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
 
 
 def filter_request_headers(headers: dict) -> dict:
     """Filter out headers that shouldn't be forwarded."""
     return {
         k: v for k, v in headers.items()
-        if k.lower() not in ("host", "content-length")
+        if k.lower() not in _EXCLUDED_REQUEST_HEADERS
     }
 
 
-def filter_response_headers(headers: dict) -> dict:
-    """Filter out headers that don't apply after httpx auto-decompresses."""
+def filter_response_headers(headers: Mapping[str, str]) -> dict:
+    """Filter out headers that don't apply after httpx auto-decompresses.
+
+    Takes the upstream httpx.Headers directly - no need to copy into a dict
+    first, since this builds the one dict we actually keep.
+    """
     return {
         k: v for k, v in headers.items()
-        if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        if k.lower() not in _EXCLUDED_RESPONSE_HEADERS
     }
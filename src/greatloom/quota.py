@@ -8,6 +8,7 @@ Compatible with the Alpha Energy dashboard.
 import json
 import logging
 import os
+from collections.abc import Mapping
 from datetime import datetime, timezone
 
 import redis
@@ -44,11 +45,11 @@ def get_redis() -> redis.Redis:
     return _redis
 
 
-def log_quota(headers: dict):
+def log_quota(headers: Mapping[str, str]):
     """Log quota headers to Redis with auto-expiry.
 
     Args:
-        headers: Response headers dict from upstream
+        headers: Response headers from upstream (httpx.Headers is fine)
     """
     # Check if response has utilization headers
     util_5h = headers.get("anthropic-ratelimit-unified-5h-utilization")
@@ -72,8 +73,8 @@ def log_quota(headers: dict):
         r = get_redis()
         r.setex(key, TTL_SECONDS, json.dumps(data))
     except redis.RedisError as e:
-        logger.error(f"Redis error logging quota: {e}")
+        logger.error("Redis error logging quota: %s", e)
         return
 
     # Log current utilization
-    logger.info(f"Quota: 5h={float(util_5h or 0)*100:.1f}%, 7d={float(util_7d or 0)*100:.1f}%")
+    logger.info("Quota: 5h=%.1f%%, 7d=%.1f%%", float(util_5h or 0) * 100, float(util_7d or 0) * 100)